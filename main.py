@@ -3,9 +3,20 @@ import json
 import random
 import datetime
 import asyncio
+import gzip
+import heapq
 import logging
 import os
-from typing import List, Dict, Any
+import tempfile
+import time
+from collections import namedtuple
+from operator import itemgetter
+from typing import List, Dict, Any, Optional, NamedTuple, Tuple
+
+try:
+    import orjson  # 可选依赖，解析大词库更快
+except ImportError:
+    orjson = None
 
 from astrbot.api.event import filter, AstrMessageEvent, MessageChain
 from astrbot.api.star import Context, Star, register
@@ -24,13 +35,191 @@ DEFAULT_CET4_VOCAB = [
     "absorb", "abstract", "abuse", "academic", "accent", "acceptable", "access", "accident"
 ]
 
+_GZIP_MAGIC = b"\x1f\x8b"
+
+def _read_json(path: str) -> Any:
+    # 按文件头判断是否为 gzip 压缩，兼容未压缩的旧文件
+    with open(path, "rb") as f:
+        raw = f.read()
+    if raw[:2] == _GZIP_MAGIC:
+        raw = gzip.decompress(raw)
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _dump_json(data: Any) -> bytes:
+    # 紧凑格式，不缩进
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+# 进程 umask 只能通过设置再恢复来读取，且不是线程安全的，因此在导入时读取一次
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def _atomic_write(path: str, payload: bytes):
+    # 先写临时文件再替换，进程中途退出也不会留下截断的文件；
+    # 临时文件名唯一，避免并发写入互相覆盖
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        # mkstemp 创建的文件权限为 0600，改为与原文件或普通 open() 新建时一致
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+_word_and_translations = itemgetter("word", "translations")
+
+def parse_vocab(data: List[Dict[str, Any]]) -> Tuple[List[str], Dict[str, str]]:
+    """解析列表格式词库，返回单词列表和英文→中文映射；条目须符合 {"word", "translations"} 结构"""
+    pairs = [_word_and_translations(e) for e in data if "word" in e]
+    words = [w for w, _ in pairs]
+    mapping = {w: t[0]["translation"] for w, t in pairs if t}
+    return words, mapping
+
+_DIGITS = re.compile(r"\d+")
+_ADD_PATTERN = re.compile(r"记单词\s*(\d+)")
+
+# 时间关键字 -> (单位秒数, 未写数字时的默认数量)；为 None 表示忽略数字
+_TIME_UNITS = {
+    "一天": (24 * 60 * 60, None),
+    "小时": (60 * 60, 1),
+    "分钟": (60, 10),
+}
+
+# 使用记录写盘的合并延迟（秒）
+FLUSH_DELAY = 0.5
+
+def _probe(path: str) -> Tuple[str, int]:
+    return path, os.path.getsize(path)
+
+def _format_size(size: int) -> str:
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    return f"{size / 1024:.1f} KB"
+
+class ArgError(Exception):
+    """指令参数缺失或不合法，异常信息直接回复给用户"""
+
+class ArgSpec(NamedTuple):
+    """单个位置参数：choices 为空表示不限取值，error 为取值不合法时的提示"""
+    name: str
+    choices: Tuple[str, ...] = ()
+    error: str = ""
+
+class CommandParser:
+    """指令参数解析器：消息只切分一次，按位置参数定义校验后返回命名元组"""
+
+    def __init__(self, specs: Tuple[ArgSpec, ...], usage: str, rest: Optional[str] = None):
+        self.specs = specs
+        self.usage = usage  # 参数不足时的提示
+        self.rest = rest  # 若指定，剩余参数以列表形式放入该字段且至少需要一个
+        fields = [spec.name for spec in specs] + ([rest] if rest else [])
+        self.result_type = namedtuple("Args", fields)
+
+    def parse(self, message_str: str):
+        # 跳过指令组名与子指令名
+        args = message_str.split()[2:]
+        required = len(self.specs) + (1 if self.rest else 0)
+        if len(args) < required:
+            raise ArgError(self.usage)
+        values = []
+        for spec, value in zip(self.specs, args):
+            if spec.choices and value not in spec.choices:
+                raise ArgError(spec.error)
+            values.append(value)
+        if self.rest:
+            values.append(args[len(self.specs):])
+        return self.result_type(*values)
+
+_REVIEW_ARGS = CommandParser(
+    (ArgSpec("mode", ("1", "2"), "复习方式不正确，请输入 1 或 2 喵～"),
+     ArgSpec("rtype", ("1", "2", "3"), "复习类型不正确，请输入 1、2 或 3 喵～")),
+    usage="请完整输入复习指令，例如：/ewords 复习 1 1",
+)
+_VERIFY_ARGS = CommandParser((), usage="请在验证指令中输入你的答案，例如：/ewords 验证 苹果 香蕉 ...", rest="answers")
+_SWITCH_ARGS = CommandParser((ArgSpec("name"),), usage="没有指定词库喵，已使用默认词库喵~")
+_TIMER_ARGS = CommandParser(
+    (), usage="请提供时间参数，如 '一天', '1小时', 自定义分钟数，或 '取消' 来取消定时提醒。", rest="time_parts")
+
+# SM-2 间隔重复参数
+SM2_INITIAL_EF = 2.5
+SM2_MIN_EF = 1.3
+# 验证结果对应的回忆质量（0~5），答对记 5，答错记 2
+SM2_QUALITY_CORRECT = 5
+SM2_QUALITY_WRONG = 2
+
+class Card(NamedTuple):
+    """单词的 SM-2 复习状态"""
+    ef: float  # 难度系数
+    interval: int  # 复习间隔（天）
+    due: float  # 下次复习时间（Unix 时间戳）
+
+def sm2_update(card: Optional[Card], quality: int, now: float) -> Card:
+    ef = card.ef if card else SM2_INITIAL_EF
+    interval = card.interval if card else 0
+    ef = max(SM2_MIN_EF, ef + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    if quality < 3 or interval == 0:
+        interval = 1
+    elif interval == 1:
+        interval = 6
+    else:
+        interval = round(interval * ef)
+    return Card(ef, interval, now + interval * 24 * 60 * 60)
+
+class WordPool:
+    """单词抽取池：未抽取的单词位于 words[:size]，抽出的单词被交换到尾部"""
+
+    def __init__(self, vocab: List[str], used: set, rng: random.Random):
+        self.rng = rng
+        unique = list(dict.fromkeys(vocab))
+        available = [w for w in unique if w not in used]
+        self.words = available + [w for w in unique if w in used]
+        self.size = len(available)
+
+    def reset(self):
+        self.size = len(self.words)
+
+    def take_all(self) -> List[str]:
+        # 一次取出全部单词（打乱顺序），抽取池随之清空
+        selected = self.words[:]
+        self.rng.shuffle(selected)
+        self.size = 0
+        return selected
+
+    def sample(self, count: int) -> List[str]:
+        # 部分 Fisher-Yates 洗牌，每次抽取 O(1)
+        words = self.words
+        selected = []
+        for _ in range(count):
+            j = self.rng.randrange(self.size)
+            self.size -= 1
+            words[j], words[self.size] = words[self.size], words[j]
+            selected.append(words[self.size])
+        return selected
+
 @register("word_plugin", "IGCrystal", "记单词及复习插件", "1.1.2", "https://github.com/IGCrystal/AstrBot_plugin_Ewords")
 class WordPlugin(Star):
     def __init__(self, context: Context, config=None):
         super().__init__(context)
         self.context = context
-        self.timer_task = None
+        self._timer_handle: Optional[asyncio.TimerHandle] = None
+        self._timer_anchor: Optional[float] = None  # 当前定时周期的起点（loop.time()）
+        self._reminder_task: Optional[asyncio.Task] = None
+        self._srs_handle: Optional[asyncio.TimerHandle] = None
+        self._srs_task: Optional[asyncio.Task] = None
+        self._dirty = False
+        self._flush_task: Optional[asyncio.Task] = None
         self.logger = logger
+        self._rng = random.Random()
 
         # 从 config 中读取配置（如果有配置传入），否则使用默认值
         default_word_count = config.get("default_word_count", 10) if config else 10
@@ -60,42 +249,61 @@ class WordPlugin(Star):
         self.vocab_dir = os.path.join(base_dir, "words")
         self.default_vocab_filename = "CET4.json"  # 默认词库文件名
         self.vocab_file = os.path.join(self.vocab_dir, self.default_vocab_filename)
-        self.used_file = os.path.join(base_dir, "used.json")
+        self.used_file = os.path.join(base_dir, "used.json.gz")
+        self.legacy_used_file = os.path.join(base_dir, "used.json")  # 旧版本未压缩的使用记录
+        self.used_log_file = os.path.join(base_dir, "used.log")  # 已用单词，追加写入，每行一个
+        self.cards_file = os.path.join(base_dir, "cards.json")
 
-        # 加载词库和使用记录
-        self.vocabularies = self.load_vocab()
+        # 词库和使用记录在后台加载，指令处理前通过 _ensure_loaded 等待
+        self.vocabularies: Dict[str, List[str]] = {}
         self.used_words = set()
-        self.word_groups = {}  # 格式：{ "group_id": [words] }
-        self.load_used_data()
+        self._used_list: List[str] = []  # 与 used_words 同步，保持加入顺序
+        self._pending_log: List[str] = []  # 尚未追加到 used.log 的单词
+        self._compact_pending = False  # 为真时整体重写 used.log
+        # 格式：{ "group_id": {word: None} }，以有序字典去重，写盘时转为列表
+        self.word_groups: Dict[str, Dict[str, None]] = {}
+        self._latest_group_id: Optional[str] = None  # 日期 ISO 格式，按字典序即按时间排序
+        self.pools: Dict[str, WordPool] = {}  # 各词库的抽取池，按需构建
+
+        # SM-2 复习卡片；堆中可能残留过期条目，以 cards 中的 due 为准
+        self.cards: Dict[str, Card] = {}
+        self._due_heap: List[Tuple[float, str]] = []
+        self._overdue: Dict[str, float] = {}  # 已到期并移出堆的单词，重新验证前不再提醒
+        self._srs_origin: Optional[str] = None  # 到期提醒发送的会话
+        self._cards_dirty = False
 
         # 存储最后一次复习数据
         self.last_review_words: List[str] = []
         self.last_review_mode: str = ""  # 仅支持 "1" 或 "2"
+        self._review_graded = False  # 同一次复习只计入一次 SM-2 评分
 
         # 标识是否切换过词库，默认未切换，使用默认词库
         self.vocab_switched = False
 
+        self._load_task = asyncio.create_task(self._bootstrap())
+
+    async def _bootstrap(self):
+        self.vocabularies = await self.load_vocab()
+        await self.load_used_data()
+        await self.load_cards()
+        self._schedule_srs_reminder()
+
+    async def _ensure_loaded(self):
+        await self._load_task
+
     # 辅助函数：将列表转换为每项前带序号的字符串
     def format_list_with_numbers(self, items: List[str]) -> str:
         return "\n".join(f"{i+1}. {item}" for i, item in enumerate(items))
 
     # 加载词库：若文件不存在或格式不正确，则使用默认CET4词库
-    def load_vocab(self) -> Dict[str, List[str]]:
+    async def load_vocab(self) -> Dict[str, List[str]]:
         if not os.path.exists(self.vocab_file):
             self.logger.info(f"词库文件 {self.vocab_file} 不存在，使用默认CET4词库")
             return {"default": DEFAULT_CET4_VOCAB}
         try:
-            with open(self.vocab_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = await asyncio.to_thread(_read_json, self.vocab_file)
             if isinstance(data, list):
-                words = []
-                mapping = {}
-                for entry in data:
-                    if isinstance(entry, dict) and "word" in entry:
-                        word = entry["word"]
-                        words.append(word)
-                        if "translations" in entry and isinstance(entry["translations"], list) and entry["translations"]:
-                            mapping[word] = entry["translations"][0].get("translation", "未知")
+                words, mapping = parse_vocab(data)
                 if mapping:
                     self.EN_TO_CN = mapping
                 self.logger.info(f"成功加载词库（列表格式），共 {len(words)} 个单词")
@@ -110,33 +318,137 @@ class WordPlugin(Star):
             self.logger.error(f"加载词库失败：{e}，使用默认CET4词库")
             return {"default": DEFAULT_CET4_VOCAB}
 
-    def load_used_data(self):
+    def _read_used_log(self) -> List[str]:
+        with open(self.used_log_file, "r", encoding="utf-8") as f:
+            return [line.rstrip("\n") for line in f if line.strip()]
+
+    async def load_used_data(self):
+        self._pending_log = []
+        self._compact_pending = False
+        legacy_words = []
+        used_file = self.used_file
+        if not os.path.exists(used_file) and os.path.exists(self.legacy_used_file):
+            used_file = self.legacy_used_file
         try:
-            with open(self.used_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                self.used_words = set(data.get("used_words", []))
-                self.word_groups = data.get("word_groups", {})
-                self.logger.info("成功加载使用记录")
+            data = await asyncio.to_thread(_read_json, used_file)
+            self.word_groups = {k: dict.fromkeys(v) for k, v in data.get("word_groups", {}).items()}
+            self._latest_group_id = max(self.word_groups, default=None)
+            # 旧版本将已用单词直接存放在 used.json 中，迁移到 used.log
+            legacy_words = data.get("used_words", [])
+            self.logger.info("成功加载使用记录")
         except Exception as e:
             self.logger.error(f"加载使用记录失败：{e}")
-            self.used_words = set()
             self.word_groups = {}
+            self._latest_group_id = None
+        log_words = []
+        if os.path.exists(self.used_log_file):
+            try:
+                log_words = await asyncio.to_thread(self._read_used_log)
+            except Exception as e:
+                self.logger.error(f"加载已用单词日志失败：{e}")
+        self._used_list = list(dict.fromkeys(legacy_words + log_words))
+        self.used_words = set(self._used_list)
+        if legacy_words:
+            self._compact_pending = True
+        if legacy_words or used_file == self.legacy_used_file:
+            self._schedule_flush()
+
+    async def load_cards(self):
+        if os.path.exists(self.cards_file):
+            try:
+                data = await asyncio.to_thread(_read_json, self.cards_file)
+                self._srs_origin = data.get("origin")
+                self.cards = {w: Card(*v) for w, v in data.get("cards", {}).items()}
+                self.logger.info(f"成功加载复习卡片，共 {len(self.cards)} 张")
+            except Exception as e:
+                self.logger.error(f"加载复习卡片失败：{e}")
+                self.cards = {}
+        self._rebuild_due_heap()
+
+    def _mark_used(self, words: List[str]):
+        for word in words:
+            if word not in self.used_words:
+                self.used_words.add(word)
+                self._used_list.append(word)
+                self._pending_log.append(word)
+
+    def _replace_used(self, words: List[str]):
+        self._used_list = list(dict.fromkeys(words))
+        self.used_words = set(self._used_list)
+        self._pending_log = []
+        self._compact_pending = True
+
+    def _take_snapshot(self):
+        data = {"word_groups": {k: list(v) for k, v in self.word_groups.items()}}
+        compact = self._compact_pending
+        lines = list(self._used_list) if compact else self._pending_log
+        cards = None
+        if self._cards_dirty:
+            cards = {"origin": self._srs_origin, "cards": {w: list(c) for w, c in self.cards.items()}}
+        self._pending_log = []
+        self._compact_pending = False
+        self._cards_dirty = False
+        return data, lines, compact, cards
+
+    def _write_used_sync(self, data: Dict[str, Any], lines: List[str], compact: bool,
+                         cards: Optional[Dict[str, Any]] = None):
+        payload = "".join(f"{w}\n" for w in lines).encode("utf-8")
+        if compact:
+            _atomic_write(self.used_log_file, payload)
+        elif payload:
+            with open(self.used_log_file, "ab") as f:
+                f.write(payload)
+        # 压缩级别 1：单词文本压缩率已足够，尽量不占用 CPU
+        _atomic_write(self.used_file, gzip.compress(_dump_json(data), compresslevel=1))
+        if os.path.exists(self.legacy_used_file):
+            os.remove(self.legacy_used_file)
+        if cards is not None:
+            _atomic_write(self.cards_file, _dump_json(cards))
 
     def save_used_data(self):
-        data = {
-            "used_words": list(self.used_words),
-            "word_groups": self.word_groups
-        }
+        self._dirty = False
         try:
-            with open(self.used_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            self._write_used_sync(*self._take_snapshot())
             self.logger.info("使用记录已保存")
         except Exception as e:
+            # 写入失败时无法确定日志状态，下次整体重写
+            self._compact_pending = True
+            self._cards_dirty = True
+            self._dirty = True
             self.logger.error(f"保存使用记录失败：{e}")
 
-    def reset_used_words(self, vocab_list: List[str]):
-        self.used_words = set(vocab_list)
-        self.save_used_data()
+    def _schedule_flush(self):
+        # 标记为脏并合并短时间内的多次修改，只写一次盘
+        self._dirty = True
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        # 写盘期间产生的新修改由下一轮循环继续写入
+        while self._dirty:
+            await asyncio.sleep(FLUSH_DELAY)
+            self._dirty = False
+            try:
+                await asyncio.to_thread(self._write_used_sync, *self._take_snapshot())
+                self.logger.info("使用记录已保存")
+            except Exception as e:
+                self._compact_pending = True
+                self._cards_dirty = True
+                self._dirty = True
+                self.logger.error(f"保存使用记录失败：{e}")
+                return
+
+    def get_pool(self, library_name: str = "default") -> WordPool:
+        pool = self.pools.get(library_name)
+        if pool is None:
+            pool = WordPool(self.vocabularies.get(library_name, []), self.used_words, self._rng)
+            self.pools[library_name] = pool
+        return pool
+
+    def reset_used_words(self, library_name: str = "default"):
+        self._replace_used(self.vocabularies.get(library_name, []))
+        self.get_pool(library_name).reset()
+        self._schedule_flush()
         self.logger.info("已重置使用记录")
 
     def get_unique_words(self, count: int, library_name: str = "default") -> List[str]:
@@ -144,61 +456,169 @@ class WordPlugin(Star):
         if count > len(vocab):
             self.logger.info(f"请求单词数 {count} 超过词库总数 {len(vocab)}，自动调整为 {len(vocab)}")
             count = len(vocab)
-        available = list(set(vocab) - self.used_words)
-        if len(available) < count:
+        pool = self.get_pool(library_name)
+        if count >= len(pool.words):
+            # 请求覆盖整个词库时直接打乱返回，无需逐个抽取或重置
+            selected = pool.take_all()
+            self._mark_used(selected)
+            self._schedule_flush()
+            self.logger.info(f"获取整个词库共 {len(selected)} 个单词")
+            return selected
+        if pool.size < count:
             self.logger.info("可用单词不足，重置使用记录")
-            self.reset_used_words(vocab)
-            available = list(set(vocab))
-        count = min(count, len(available))
-        selected = random.sample(available, count)
-        self.used_words.update(selected)
-        self.save_used_data()
+            self.reset_used_words(library_name)
+        count = min(count, pool.size)
+        selected = pool.sample(count)
+        self._mark_used(selected)
+        self._schedule_flush()
         self.logger.info(f"获取 {count} 个不重复的单词")
         return selected
 
     def save_word_group(self, words: List[str]):
         group_id = datetime.date.today().isoformat()
-        if group_id in self.word_groups:
-            # 合并时去重并保持顺序
-            combined = list(dict.fromkeys(self.word_groups[group_id] + words))
-            self.word_groups[group_id] = combined
-        else:
-            self.word_groups[group_id] = words
-        self.save_used_data()
+        # 合并时去重并保持顺序
+        self.word_groups.setdefault(group_id, {}).update(dict.fromkeys(words))
+        if self._latest_group_id is None or group_id >= self._latest_group_id:
+            self._latest_group_id = group_id
+        self._schedule_flush()
         self.logger.info(f"保存单词组：{group_id}")
 
     def get_latest_group(self) -> List[str]:
-        if not self.word_groups:
+        if self._latest_group_id is None:
             return []
-        latest_group = sorted(self.word_groups.keys())[-1]
-        return self.word_groups.get(latest_group, [])
+        return list(self.word_groups.get(self._latest_group_id, {}))
 
     def parse_time_interval(self, time_str: str) -> int:
         self.logger.info(f"解析时间参数：{time_str}")
-        if "一天" in time_str:
-            return 24 * 60 * 60
-        if "小时" in time_str:
-            num = int(''.join(re.findall(r'\d+', time_str)) or 1)
-            return num * 60 * 60
-        if "分钟" in time_str:
-            num = int(''.join(re.findall(r'\d+', time_str)) or 10)
-            return num * 60
+        for keyword, (unit, default) in _TIME_UNITS.items():
+            if keyword in time_str:
+                if default is None:
+                    return unit
+                match = _DIGITS.search(time_str)
+                return (int(match.group()) if match else default) * unit
         try:
             minutes = int(time_str)
             return minutes * 60
         except:
             return 10 * 60
 
-    async def start_timer(self, unified_msg_origin: str, interval: int):
+    def _rebuild_due_heap(self):
+        self._due_heap = [(c.due, w) for w, c in self.cards.items() if w not in self._overdue]
+        heapq.heapify(self._due_heap)
+
+    def _pop_due(self, now: float) -> List[str]:
+        # 将堆中已到期的单词移入 _overdue，返回新移入的单词
+        popped = []
+        heap = self._due_heap
+        while heap and heap[0][0] <= now:
+            due, word = heapq.heappop(heap)
+            if self._is_current(due, word):
+                self._overdue[word] = due
+                popped.append(word)
+        return popped
+
+    def _is_current(self, due: float, word: str) -> bool:
+        card = self.cards.get(word)
+        return card is not None and card.due == due
+
+    def update_cards(self, words: List[str], results: List[bool]):
+        now = time.time()
+        for word, ok in zip(words, results):
+            card = self.cards.get(word)
+            if card is not None and card.due > now:
+                # 未到期的单词不提前升级，防止集中刷题拉长间隔；答错时退回 1 天
+                if ok:
+                    continue
+                card = Card(card.ef, 1, now + 24 * 60 * 60)
+            else:
+                quality = SM2_QUALITY_CORRECT if ok else SM2_QUALITY_WRONG
+                card = sm2_update(card, quality, now)
+            self.cards[word] = card
+            self._overdue.pop(word, None)
+            heapq.heappush(self._due_heap, (card.due, word))
+        # 过期条目过多时重建堆
+        if len(self._due_heap) > 2 * len(self.cards):
+            self._rebuild_due_heap()
+        self._cards_dirty = True
+        self._schedule_flush()
+        self._schedule_srs_reminder()
+
+    def get_due_words(self, limit: int) -> List[str]:
+        self._pop_due(time.time())
+        # 只复习当前词库中的单词，其他词库的卡片保留到切换回去时再复习
+        due = heapq.nsmallest(limit, ((d, w) for w, d in self._overdue.items() if w in self.EN_TO_CN))
+        return [w for _, w in due]
+
+    def _schedule_srs_reminder(self):
+        if self._srs_handle is not None:
+            self._srs_handle.cancel()
+            self._srs_handle = None
+        heap = self._due_heap
+        while heap and not self._is_current(*heap[0]):
+            heapq.heappop(heap)
+        if not heap or self._srs_origin is None:
+            return
+        delay = max(0.0, heap[0][0] - time.time())
+        self._srs_handle = asyncio.get_running_loop().call_later(delay, self._fire_srs_reminder)
+
+    def _fire_srs_reminder(self):
+        # 已提醒的单词出堆，重新验证后才会再次入堆
+        self._srs_handle = None
+        count = sum(1 for w in self._pop_due(time.time()) if w in self.EN_TO_CN)
+        if count:
+            self._srs_task = asyncio.create_task(self._send_srs_reminder(self._srs_origin, count))
+        self._schedule_srs_reminder()
+
+    async def _send_srs_reminder(self, unified_msg_origin: str, count: int):
+        try:
+            message_chain = MessageChain().message(
+                f"【复习提醒】有 {count} 个单词到期啦，使用 /ewords 复习 2 3 开始到期复习喵～")
+            await self.context.send_message(unified_msg_origin, message_chain)
+            self.logger.info(f"发送到期复习提醒：{count} 个单词")
+        except Exception as e:
+            self.logger.error(f"发送到期复习提醒失败：{e}")
+
+    def start_timer(self, unified_msg_origin: str, interval: int):
+        interval = max(interval, 60)
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self._timer_handle is not None:
+            # 修改间隔时保留当前周期已经过的时间
+            self._timer_handle.cancel()
+            anchor = self._timer_anchor
+            when = anchor + interval * ((now - anchor) // interval + 1)
+        else:
+            self._timer_anchor = now
+            when = now + interval
         self.logger.info(f"开始持续定时提醒，每 {interval} 秒提醒一次")
-        while True:
-            await asyncio.sleep(interval)
-            try:
-                message_chain = MessageChain().message("【提醒】该记单词啦！")
-                await self.context.send_message(unified_msg_origin, message_chain)
-                self.logger.info("发送定时提醒")
-            except Exception as e:
-                self.logger.error(f"发送定时提醒失败：{e}")
+        # 提醒内容固定，构建一次后每次触发复用
+        message_chain = MessageChain().message("【提醒】该记单词啦！")
+        self._timer_handle = loop.call_at(when, self._fire_reminder, unified_msg_origin, message_chain, interval, when)
+
+    def stop_timer(self) -> bool:
+        if self._timer_handle is None:
+            return False
+        self._timer_handle.cancel()
+        self._timer_handle = None
+        self._timer_anchor = None
+        return True
+
+    def _fire_reminder(self, unified_msg_origin: str, message_chain: MessageChain, interval: int, when: float):
+        # 以计划时间而非实际唤醒时间推算下一次，避免误差累积；
+        # 事件循环卡顿错过的周期直接跳过，不补发
+        self._timer_anchor = when
+        loop = asyncio.get_running_loop()
+        next_when = when + interval * max((loop.time() - when) // interval + 1, 1)
+        self._timer_handle = loop.call_at(next_when, self._fire_reminder,
+                                          unified_msg_origin, message_chain, interval, next_when)
+        self._reminder_task = asyncio.create_task(self._send_reminder(unified_msg_origin, message_chain))
+
+    async def _send_reminder(self, unified_msg_origin: str, message_chain: MessageChain):
+        try:
+            await self.context.send_message(unified_msg_origin, message_chain)
+            self.logger.info("发送定时提醒")
+        except Exception as e:
+            self.logger.error(f"发送定时提醒失败：{e}")
 
     @filter.command_group("ewords")
     def ewords(self):
@@ -208,8 +628,8 @@ class WordPlugin(Star):
     @ewords.command("记单词")
     async def add_words(self, event: AstrMessageEvent):
         self.logger.info("接收到记单词指令")
-        pattern = r"记单词\s*(\d+)"
-        match = re.search(pattern, event.message_str)
+        await self._ensure_loaded()
+        match = _ADD_PATTERN.search(event.message_str)
         # 如果没有匹配到数字，则默认count为10
         count = int(match.group(1)) if match and match.group(1) else 10
         if count < 10:
@@ -233,18 +653,15 @@ class WordPlugin(Star):
     @ewords.command("复习")
     async def review_words(self, event: AstrMessageEvent):
         self.logger.info("接收到复习指令")
-        self.load_used_data()  # 重新加载最新记录
-        tokens = event.message_str.strip().split()
-        if len(tokens) < 4:
-            self.logger.error("复习指令参数不完整")
-            yield event.plain_result("请完整输入复习指令，例如：/ewords 复习 1 1")
-            return
-        mode = tokens[2]  # 复习方式：1（英文→中文），2（中文→英文）
-        if mode not in ["1", "2"]:
-            self.logger.error(f"复习方式参数错误：{mode}")
-            yield event.plain_result("复习方式不正确，请输入 1 或 2 喵～")
+        await self._ensure_loaded()
+        try:
+            args = _REVIEW_ARGS.parse(event.message_str)
+        except ArgError as e:
+            self.logger.error(f"复习指令参数错误：{e}")
+            yield event.plain_result(str(e))
             return
-        rtype = tokens[3]  # 复习类型：1 按组复习，2 随机复习
+        mode = args.mode  # 复习方式：1（英文→中文），2（中文→英文）
+        rtype = args.rtype  # 复习类型：1 按组复习，2 随机复习，3 到期复习
         self.last_review_mode = mode
         words = []
         if rtype == "1":
@@ -254,14 +671,14 @@ class WordPlugin(Star):
                 yield event.plain_result("没有按组记录，请先使用记单词指令记录单词喵～")
                 return
             words = group
-            words = list(dict.fromkeys(words))
         elif rtype == "2":
-            all_used = list(self.used_words)
-            words = random.sample(all_used, min(10, len(all_used)))
+            all_used = self._used_list
+            words = self._rng.sample(all_used, min(10, len(all_used)))
         else:
-            self.logger.error(f"复习类型参数错误：{rtype}")
-            yield event.plain_result("复习类型不正确，请输入 1 或 2 喵～")
-            return
+            words = self.get_due_words(10)
+            if not words:
+                yield event.plain_result("当前没有到期需要复习的单词喵～")
+                return
 
         if not words:
             self.logger.error("无可复习单词")
@@ -269,9 +686,10 @@ class WordPlugin(Star):
             return
 
         self.last_review_words = words
+        self._review_graded = False
         if mode == "1":
             content = "复习开始！请翻译下面的单词：\n" + self.format_list_with_numbers(words)
-        elif mode == "2":
+        else:
             prompts = [self.EN_TO_CN.get(w, "未知") for w in words]
             content = "复习开始！请写出下列中文对应的英文单词：\n" + self.format_list_with_numbers(prompts)
         self.logger.info("复习内容已发送")
@@ -281,12 +699,13 @@ class WordPlugin(Star):
     @ewords.command("验证", alias={'核对', '校对', '答案'})
     async def verify(self, event: AstrMessageEvent):
         self.logger.info("接收到验证指令")
-        tokens = event.message_str.strip().split()
-        if len(tokens) < 3:
-            self.logger.error("验证指令参数不完整")
-            yield event.plain_result("请在验证指令中输入你的答案，例如：/ewords 验证 苹果 香蕉 ...")
+        await self._ensure_loaded()
+        try:
+            user_answers = _VERIFY_ARGS.parse(event.message_str).answers
+        except ArgError as e:
+            self.logger.error(f"验证指令参数错误：{e}")
+            yield event.plain_result(str(e))
             return
-        user_answers = tokens[2:]
         if not self.last_review_words:
             self.logger.error("没有复习记录")
             yield event.plain_result("没有找到上一次的复习记录，请先进行复习喵～")
@@ -307,9 +726,20 @@ class WordPlugin(Star):
             yield event.plain_result(f"答案数量不匹配，应该有 {len(expected)} 个答案喵～")
             return
 
-        correct = sum(1 for ua, exp in zip(user_answers, expected) if ua.strip().lower() == exp.lower())
-        feedback = [f"{i+1}. {'正确' if ua.strip().lower() == exp.lower() else f'错误（正确答案：{exp}）'}"
-                    for i, (ua, exp) in enumerate(zip(user_answers, expected))]
+        # 单次遍历同时得出逐词结果、正确数与反馈
+        correct = 0
+        results = []
+        feedback = []
+        for i, (ua, exp) in enumerate(zip(user_answers, expected)):
+            ok = ua.strip().lower() == exp.lower()
+            correct += ok
+            results.append(ok)
+            feedback.append(f"{i+1}. {'正确' if ok else f'错误（正确答案：{exp}）'}")
+        # 中文释义含空格，英→中答案无法按空格切分后精确匹配，只用中→英结果安排复习
+        if not self._review_graded and self.last_review_mode == "2":
+            self._review_graded = True
+            self._srs_origin = event.unified_msg_origin
+            self.update_cards(self.last_review_words, results)
         reply = f"验证结果：{correct}/{len(expected)} 正确\n" + "\n".join(feedback)
         self.logger.info("验证完成")
         yield event.plain_result(reply)
@@ -317,23 +747,28 @@ class WordPlugin(Star):
     @ewords.command("切换", alias={'切换词库'})
     async def switch_vocab(self, event: AstrMessageEvent):
         self.logger.info("接收到切换词库指令")
+        await self._ensure_loaded()
         if not os.path.exists(self.vocab_dir):
             os.makedirs(self.vocab_dir)
             self.logger.info(f"目录 {self.vocab_dir} 不存在，已创建。")
-        tokens = event.message_str.strip().split()
         # 如果用户没有指定词库文件名，则提示使用默认词库
-        if len(tokens) < 3 or not tokens[2].strip():
-            yield event.plain_result("没有指定词库喵，已使用默认词库喵~")
+        try:
+            param = _SWITCH_ARGS.parse(event.message_str).name
+        except ArgError as e:
+            yield event.plain_result(str(e))
             return
-        param = tokens[2].strip()
         if param.lower() == "list":
             try:
-                files = os.listdir(self.vocab_dir)
+                files = await asyncio.to_thread(os.listdir, self.vocab_dir)
                 vocab_files = [f for f in files if f.endswith(".json")]
                 if not vocab_files:
                     yield event.plain_result("没有找到任何词库文件喵～")
                 else:
-                    reply = "可用词库列表：\n" + self.format_list_with_numbers(vocab_files)
+                    results = await asyncio.gather(
+                        *(asyncio.to_thread(_probe, os.path.join(self.vocab_dir, f)) for f in vocab_files)
+                    )
+                    items = [f"{name}（{_format_size(size)}）" for name, (_, size) in zip(vocab_files, results)]
+                    reply = "可用词库列表：\n" + self.format_list_with_numbers(items)
                     yield event.plain_result(reply)
             except Exception as e:
                 yield event.plain_result(f"获取词库列表失败: {e}")
@@ -342,20 +777,13 @@ class WordPlugin(Star):
             param += ".json"
         vocab_path = os.path.join(self.vocab_dir, param)
         try:
-            with open(vocab_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = await asyncio.to_thread(_read_json, vocab_path)
             if isinstance(data, list):
-                words = []
-                mapping = {}
-                for entry in data:
-                    if isinstance(entry, dict) and "word" in entry:
-                        word = entry["word"]
-                        words.append(word)
-                        if "translations" in entry and isinstance(entry["translations"], list) and entry["translations"]:
-                            mapping[word] = entry["translations"][0].get("translation", "未知")
+                words, mapping = parse_vocab(data)
                 self.vocabularies["default"] = words
                 self.EN_TO_CN = mapping
-                self.reset_used_words(words)
+                self.pools.pop("default", None)
+                self.reset_used_words()
                 yield event.plain_result(f"成功切换词库为 '{param}' 喵～")
                 self.logger.info(f"成功切换词库为 {param}")
             else:
@@ -366,23 +794,31 @@ class WordPlugin(Star):
     @ewords.command("清空", alias={'清空历史'})
     async def clear_history(self, event: AstrMessageEvent):
         self.logger.info("接收到清空记忆指令")
-        self.used_words = set()
+        await self._ensure_loaded()
+        self._replace_used([])
         self.word_groups = {}
-        self.save_used_data()
+        self._latest_group_id = None
+        for pool in self.pools.values():
+            pool.reset()
+        self.cards = {}
+        self._due_heap = []
+        self._overdue = {}
+        self._cards_dirty = True
+        self._schedule_srs_reminder()
+        self._schedule_flush()
         yield event.plain_result("已清空所有记忆历史喵～")
 
     @ewords.command("设置定时", alias={'定时'})
     async def set_timer(self, event: AstrMessageEvent):
         self.logger.info("接收到设置定时指令")
-        tokens = event.message_str.strip().split(maxsplit=2)
-        if len(tokens) < 3:
-            self.logger.error("设置定时参数不完整")
-            yield event.plain_result("请提供时间参数，如 '一天', '1小时', 自定义分钟数，或 '取消' 来取消定时提醒。")
+        try:
+            param = " ".join(_TIMER_ARGS.parse(event.message_str).time_parts)
+        except ArgError as e:
+            self.logger.error(f"设置定时参数错误：{e}")
+            yield event.plain_result(str(e))
             return
-        param = tokens[2].strip()
         if param == "取消":
-            if self.timer_task and not self.timer_task.done():
-                self.timer_task.cancel()
+            if self.stop_timer():
                 self.logger.info("定时任务已取消")
                 yield event.plain_result("定时提醒已取消喵～")
             else:
@@ -390,12 +826,7 @@ class WordPlugin(Star):
             return
         time_str = param
         seconds = self.parse_time_interval(time_str)
-        if self.timer_task and not self.timer_task.done():
-            self.timer_task.cancel()
-            self.logger.info("旧定时任务已取消")
-        self.timer_task = asyncio.create_task(
-            self.start_timer(event.unified_msg_origin, seconds)
-        )
+        self.start_timer(event.unified_msg_origin, seconds)
         self.logger.info(f"定时提醒设置为 {time_str}")
         yield event.plain_result(f"定时提醒已设置为 {time_str}，请注意查收消息喵～")
 
@@ -407,7 +838,7 @@ class WordPlugin(Star):
             "1. /ewords 记单词 <数字> —— 记单词（例如：/ewords 记单词 15）\n"
             "2. /ewords 复习 <方式> <复习类型> —— 复习指令\n"
             "    方式：1（英文→中文），2（中文→英文）\n"
-            "    复习类型：1 按组复习（使用最新一组记录），2 随机复习\n"
+            "    复习类型：1 按组复习（使用最新一组记录），2 随机复习，3 到期复习（按 SM-2 间隔重复安排）\n"
             "    例如：/ewords 复习 1 1\n"
             "3. /ewords 验证 <答案1> <答案2> ... —— 验证上次复习答案\n"
             "4. /ewords 切换 <文件名|list> —— 切换词库或列出词库文件（例如：/ewords 切换 random 或 /ewords 切换 list）\n"
@@ -422,7 +853,22 @@ class WordPlugin(Star):
         return f"I enjoy eating **{word}** when the weather is nice."
 
     async def terminate(self):
-        if self.timer_task:
-            self.timer_task.cancel()
+        if not self._load_task.done():
+            self._load_task.cancel()
+        if self.stop_timer():
             self.logger.info("定时任务已取消")
+        if self._reminder_task and not self._reminder_task.done():
+            self._reminder_task.cancel()
+        if self._srs_handle is not None:
+            self._srs_handle.cancel()
+        if self._srs_task and not self._srs_task.done():
+            self._srs_task.cancel()
+        if self._flush_task and not self._flush_task.done():
+            # 不能取消：取消不会停止工作线程中的写入，且会跳过失败时的恢复逻辑
+            try:
+                await self._flush_task
+            except Exception as e:
+                self.logger.error(f"等待使用记录写入失败：{e}")
+        if self._dirty:
+            self.save_used_data()
 